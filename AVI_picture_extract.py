@@ -3,31 +3,73 @@
 # Purpose: For each .AVI in ONE folder, save a PNG of the LAST frame to a
 #          subfolder named "AVI_last_frames". Useful for OCR timestamp scripts.
 # Author: Ashley Starr
-# Last Updated: 2025-08-17
+# Last Updated: 2026-10-15
 # Python: 3.8+
-# Requirements: opencv-python
+# Requirements: opencv-python, av (PyAV; optional but strongly recommended)
 #
 # Usage (CHANGE THESE PATHS):
 #   Windows (CMD/PowerShell):
 #     py AVI_picture_extract.py --folder "C:\path\to\your\data"
+#     py AVI_picture_extract.py --folder "C:\path\to\your\data" --workers 4
 #
 #   macOS/Linux:
 #     python3 AVI_picture_extract.py --folder "/path/to/your/data"
 #
 # Notes:
 # - Writes images to: <folder>\AVI_last_frames\<video_basename>_lastframe.png
+#   (or .jpg with --format jpg; PNGs use fast, light compression)
 # - This scans ONLY the provided folder (non-recursive).
-# - If the last frame seek fails (some codecs), a fallback method is tried.
+# - Videos are processed in parallel (one process per core; --workers to change).
+# - With PyAV installed, the last frame is read by seeking to the final keyframe
+#   and decoding forward (fast, bounded work). Without it (or if that fails),
+#   OpenCV seeks to the last frame and, if that fails too, reads the whole clip.
 # =============================================================================
 
 # ========== 0) Imports & Globals ==============================================
 import os
 import argparse
 import cv2
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+try:
+    import av  # PyAV: keyframe-aware seeking; falls back to OpenCV if missing
+except ImportError:
+    av = None
+
+# Frames are temporary OCR inputs: favor encode speed over file size
+WRITE_PARAMS = {
+    "png": [cv2.IMWRITE_PNG_COMPRESSION, 1],
+    "jpg": [cv2.IMWRITE_JPEG_QUALITY, 95],
+}
 
 
 # ========== 1) Helper Functions ===============================================
+def _read_last_frame_pyav(video_path: str) -> "cv2.Mat | None":
+    """
+    Seek by timestamp to the keyframe before the end of the video, then decode
+    forward to the final frame (bounded work regardless of clip length).
+
+    Returns:
+        BGR frame as ndarray, or None if the duration/stream is unknown.
+    """
+    with av.open(video_path) as container:
+        if not container.streams.video:
+            return None
+        stream = container.streams.video[0]
+        if stream.duration:
+            end_pts = (stream.start_time or 0) + stream.duration
+            container.seek(end_pts, stream=stream, backward=True, any_frame=False)
+        elif container.duration:
+            container.seek(container.duration, backward=True, any_frame=False)
+        else:
+            return None
+        last = None
+        for frame in container.decode(stream):
+            last = frame
+    return None if last is None else last.to_ndarray(format="bgr24")
+
+
 def read_last_frame(video_path: str) -> Tuple[bool, "cv2.Mat | None"]:
     """
     Attempt to read the last frame of an AVI using multiple strategies.
@@ -35,11 +77,22 @@ def read_last_frame(video_path: str) -> Tuple[bool, "cv2.Mat | None"]:
     Returns:
         (success, frame)
     """
+    # Strategy A: PyAV - keyframe-aware seek to the last GOP
+    if av is not None:
+        try:
+            frame = _read_last_frame_pyav(video_path)
+        except Exception:
+            # FFmpegError on exotic codecs/containers, ValueError from to_ndarray on odd
+            # pixel formats, ...: never let one file stop the run, fall through to OpenCV
+            frame = None
+        if frame is not None:
+            return True, frame
+
+    # Strategy B: OpenCV direct seek to last index
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         return False, None
 
-    # Strategy A: direct seek to last index
     frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))  # may be 0/unknown for some codecs
     if frame_count and frame_count > 1:
         cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count - 1)
@@ -48,13 +101,6 @@ def read_last_frame(video_path: str) -> Tuple[bool, "cv2.Mat | None"]:
             cap.release()
             return True, frame
 
-    # Strategy B: ratio seek near end
-    cap.set(cv2.CAP_PROP_POS_AVI_RATIO, 0.999)  # seek to ~end
-    ok, frame = cap.read()
-    if ok and frame is not None:
-        cap.release()
-        return True, frame
-
     # Strategy C: sequential read to end (slow for long videos, but reliable)
     cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
     last = None
@@ -67,8 +113,32 @@ def read_last_frame(video_path: str) -> Tuple[bool, "cv2.Mat | None"]:
     return (last is not None), last
 
 
+def _init_worker() -> None:
+    """Keep OpenCV single-threaded inside each worker to avoid oversubscription."""
+    cv2.setNumThreads(1)
+
+
+def _process_one(path: str, out_dir: str, fmt: str = "png") -> Tuple[bool, str]:
+    """
+    Read the last frame of ONE video and write it as PNG (or JPG) into out_dir.
+
+    Returns:
+        (ok, message)
+    """
+    filename = os.path.basename(path)
+    success, frame = read_last_frame(path)
+    if not (success and frame is not None):
+        return False, f"ERROR: Could not read last frame of: {filename}"
+
+    base = os.path.splitext(filename)[0]
+    out_path = os.path.join(out_dir, f"{base}_lastframe.{fmt}")
+    if cv2.imwrite(out_path, frame, WRITE_PARAMS[fmt]):
+        return True, f"Saved last frame: {filename} -> {out_path}"
+    return False, f"ERROR: Failed to write image for: {filename}"
+
+
 # ========== 2) Core Pipeline ====================================================
-def process_folder(folder: str) -> None:
+def process_folder(folder: str, workers: Optional[int] = None, fmt: str = "png") -> None:
     if not os.path.isdir(folder):
         raise SystemExit(f"ERROR: Folder does not exist: {folder}")
 
@@ -80,27 +150,23 @@ def process_folder(folder: str) -> None:
         print("No .avi files found in the folder.")
         return
 
-    print(f"Found {len(avi_files)} AVI file(s). Processing...")
+    workers = max(1, workers or os.cpu_count() or 1)
+    if os.name == "nt":
+        workers = min(61, workers)  # Windows ProcessPoolExecutor rejects max_workers > 61
+    print(f"Found {len(avi_files)} AVI file(s). Processing with {workers} worker(s)...")
 
     ok_count = 0
     fail_count = 0
 
-    for filename in avi_files:
-        path = os.path.join(folder, filename)
-        success, frame = read_last_frame(path)
-
-        if success and frame is not None:
-            base = os.path.splitext(filename)[0]
-            out_path = os.path.join(out_dir, f"{base}_lastframe.png")
-            if cv2.imwrite(out_path, frame):
+    # Each AVI is independent (decode-bound), so fan the files out across cores
+    paths = [os.path.join(folder, f) for f in avi_files]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as ex:
+        for ok, msg in ex.map(_process_one, paths, [out_dir] * len(paths), [fmt] * len(paths), chunksize=4):
+            if ok:
                 ok_count += 1
-                print(f"Saved last frame: {filename} -> {out_path}")
             else:
                 fail_count += 1
-                print(f"ERROR: Failed to write image for: {filename}")
-        else:
-            fail_count += 1
-            print(f"ERROR: Could not read last frame of: {filename}")
+            print(msg)
 
     print(f"\nSummary: {ok_count} saved, {fail_count} failed, out of {len(avi_files)} AVI file(s).")
     print(f"Output folder: {out_dir}")
@@ -116,9 +182,22 @@ def parse_args() -> argparse.Namespace:
         required=True,
         help='Folder containing .AVI files (non-recursive). Example (Windows): "C:\\path\\to\\your\\KO_2_1"',
     )
+    p.add_argument(
+        "--format",
+        choices=sorted(WRITE_PARAMS),
+        default="png",
+        help="Image format for saved frames (default: png). jpg is faster to write; "
+             "PNG_timestamp_extract.py reads both.",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of parallel worker processes (default: number of CPU cores).",
+    )
     return p.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    process_folder(args.folder)
\ No newline at end of file
+    process_folder(args.folder, args.workers, args.format)
\ No newline at end of file
@@ -3,7 +3,7 @@
 # Purpose: Read the OCR output CSV from PNG_timestamp_extract.py and split the
 #          "timestamp" column into "Date" (YYYY-MM-DD) and "Time" (HH:MM:SS).
 # Author: Ashley Starr
-# Last Updated: 2025-08-16
+# Last Updated: 2026-10-15
 # Python: 3.8+
 # Requirements: pandas
 #
@@ -28,20 +28,12 @@ import re
 import argparse
 import pandas as pd
 
-# Regex: handles optional leading apostrophe and/or Excel ="...":
+# One compact pattern (fullmatch on the stripped value) that tolerates the
+# Excel wrappers itself:
 #   '2024-08-01 06:31:27
 #   ="2024-08-01 06:31:27"
 #   2024-08-01 06:31:27
-TS_RE = re.compile(
-    r"""^\s*                 # leading spaces
-        (?:'=?"?|=?"?)?      # optional ' or =" or ="
-        (\d{4})-(\d{2})-(\d{2})   # YYYY-MM-DD
-        \s+
-        (\d{2}):(\d{2}):(\d{2})   # HH:MM:SS
-        "?$                   # optional closing quote
-    """,
-    re.VERBOSE,
-)
+TS_RE = re.compile(r"""'?=?"?(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})"?""")
 
 
 # ========== 1) Helpers =========================================================
@@ -49,14 +41,21 @@ def split_ts(value: str):
     """Return (Date, Time) from a timestamp string, or ('Not found','Not found')."""
     if not isinstance(value, str):
         return ("Not found", "Not found")
-    v = value.strip()
-    m = TS_RE.match(v)
+    m = TS_RE.fullmatch(value.strip())
     if not m:
         return ("Not found", "Not found")
     y, M, d, h, mi, s = m.groups()
     return (f"{y}-{M}-{d}", f"{h}:{mi}:{s}")
 
 
+def split_ts_column(ts: pd.Series):
+    """split_ts over a whole column in one per-row pass -> (dates, times, parsed_ok)."""
+    pairs = [split_ts(v) for v in ts]
+    dates = [d for d, _ in pairs]
+    times = [t for _, t in pairs]
+    return dates, times, sum(d != "Not found" for d in dates)
+
+
 def reorder_columns_with_date_time(df: pd.DataFrame) -> pd.DataFrame:
     """Place Date/Time after 'timestamp' if present; otherwise just append."""
     base = ["file", "timestamp", "Date", "Time"]
@@ -76,13 +75,12 @@ def run(input_csv: str, output_csv: str) -> None:
     if "timestamp" not in df.columns:
         raise SystemExit("ERROR: Column 'timestamp' not found in input CSV.")
 
-    # Split timestamps
-    dates, times = zip(*(split_ts(v) for v in df["timestamp"]))
-    df["Date"] = list(dates)
-    df["Time"] = list(times)
+    # Split timestamps (one regex match per row yields both parts)
+    dates, times, parsed_ok = split_ts_column(df["timestamp"])
+    df["Date"] = dates
+    df["Time"] = times
 
     # Quick summary for QC
-    parsed_ok = sum(d != "Not found" and t != "Not found" for d, t in zip(dates, times))
     total = len(df)
     print(f"Parsed {parsed_ok}/{total} rows into Date/Time.")
 
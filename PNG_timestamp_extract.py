@@ -4,9 +4,11 @@
 #          and write a CSV with the parsed timestamps. Includes robust parsing,
 #          variant image preprocessing, and weighted voting across candidates.
 # Author: Ashley Starr
-# Last Updated: 2025-08-17
+# Last Updated: 2026-10-15
 # Python: 3.9+
 # Requirements: opencv-python, pytesseract, numpy
+#               tesserocr + pillow (optional; OCR in-process instead of one
+#               Tesseract subprocess per crop - much faster)
 #
 # ⚠️ Recommendation:
 #   After this runs, SPOT-CHECK the timestamps against the images. If any are wrong,
@@ -27,6 +29,11 @@
 # - Accepts .png/.jpg/.jpeg files in ONE folder (non-recursive).
 # - Output CSV columns: file, timestamp (quoted for Excel), raw_ocr
 # - Explicit Tesseract path is set via --tesseract_cmd (default is Ashley's path).
+# - Images are OCR'd in parallel (--workers, default: half the CPU cores).
+# - --batch_ocr stacks all crops of an image into ONE Tesseract call (faster).
+# - OCR stops early on a clear winner; --exhaustive tries every crop (QC runs).
+# - Crops with too few digit-like blobs skip OCR (unless that would skip every crop
+#   of an image); --no_prefilter disables this.
 # =============================================================================
 
 # ========== 0) Imports & CLI Config ===========================================
@@ -35,11 +42,26 @@ import re
 import csv
 import cv2
 import pytesseract
+from pytesseract import Output
 import numpy as np
 import argparse
 import datetime as dt
+import multiprocessing as mp
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
+
+# One Tesseract (OpenMP) thread per worker; we parallelize over images instead.
+# Must be set before tesserocr loads libtesseract, and is inherited by pytesseract.
+# A value the user already set is left alone.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+try:
+    # In-process Tesseract API (no subprocess per OCR call); optional
+    from PIL import Image
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except ImportError:
+    PyTessBaseAPI = None
 
 # ========== 1) CLI / User Options =============================================
 def parse_args() -> argparse.Namespace:
@@ -61,6 +83,16 @@ def parse_args() -> argparse.Namespace:
                    help="Directory for debug outputs (default: <image_folder>\\_ocr_debug).")
     p.add_argument("--elite_margin", type=float, default=0.8,
                    help="How far the top candidate must lead to skip voting (default: 0.8).")
+    p.add_argument("--batch_ocr", action="store_true",
+                   help="Run ONE Tesseract call per image on all crops stacked together (faster; "
+                        "uses block layout mode, so spot-check accuracy on your data).")
+    p.add_argument("--exhaustive", action="store_true",
+                   help="OCR every ROI/variant (no early stop, no ROI skipping). Slower; for QC runs.")
+    p.add_argument("--no_prefilter", action="store_true",
+                   help="OCR every crop, even ones with too few digit-like blobs to hold a timestamp "
+                        "(for accuracy audits).")
+    p.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                   help="Number of parallel OCR worker processes (default: half the CPU cores).")
     return p.parse_args()
 
 
@@ -72,18 +104,32 @@ TESS_CFG = (
     "-c tessedit_char_whitelist=0123456789:- "
     "-c preserve_interword_spaces=1"
 )
+# --batch_ocr: all crops stacked into one image, so read it as a block of lines
+TESS_CFG_BATCH = TESS_CFG.replace("--psm 7", "--psm 6")
+BATCH_PAD = 24  # white rows above/below each stacked crop
 
 # Flexible timestamp regexes
 FLEX_PAT = re.compile(r'(20\d{2})\D{0,4}(\d{2})\D{0,4}(\d{2})\D{0,6}(\d{1,2})\D{0,4}(\d{2})\D{0,4}(\d{2})')
 DATE_THEN_TIME_1OR2H = re.compile(r'(20\d{2})\D{0,5}(\d{2})\D{0,5}(\d{2}).{0,12}?(\d{1,2})\D{0,3}(\d{2})\D{0,3}(\d{2})')
-TS_PATTERNS = [
+TS_PATTERNS = [re.compile(p) for p in (
     r'(20\d{2})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2}):(\d{2})',
     r'(20\d{2})(\d{2})(\d{2})[ T]?(\d{2})(\d{2})(\d{2})',
     r'(20\d{2})-(\d{2})-(\d{2}).{0,3}(\d{2}).{0,3}(\d{2}).{0,3}(\d{2})',
-]
+)]
+# FLEX_PAT + TS_PATTERNS as one alternation (FLEX first): a single scan tells us
+# whether any fallback can match at all, and a FLEX hit is FLEX_PAT's own match.
+FALLBACK_RE = re.compile("|".join(f"(?P<a{i}>{p.pattern})" for i, p in enumerate([FLEX_PAT] + TS_PATTERNS)))
 _SLASH_LIKE = r'[\/\\\u2215\u2044\uFF0F\uFF3C]'
 SLASH_RE = re.compile(_SLASH_LIKE)
 
+# OCR look-alike fixes for normalize_ocr, applied in one str.translate pass
+_NORM_TABLE = str.maketrans({
+    'O': '0', 'o': '0', 'I': '1', 'l': '1', 'S': '5', 'B': '8',
+    '—': '-', '–': '-', '\n': ' ',
+})
+_WS_RE = re.compile(r'\s+')
+_DUP_SEP_RE = re.compile(r':{2,}|-{2,}')
+
 # Weights (ROI & variant)
 ROI_WEIGHT = {"left70": 3.2, "full": 1.4, "mid60": -1.0, "right60": -1.5}
 VARIANT_WEIGHT = {
@@ -112,18 +158,14 @@ def repair_time_triplets(s: str) -> str:
         return m.group(1) + tri
     return TRIPLET_FIELD.sub(_fix, s)
 
+@lru_cache(maxsize=1024)  # variants of one image often OCR to the same string
 def normalize_ocr(s: str) -> str:
     if not s:
         return ""
-    t = s.replace("\n", " ").strip()
-    t = (t.replace('O', '0').replace('o', '0')
-           .replace('I', '1').replace('l', '1')
-           .replace('S', '5').replace('B', '8')
-           .replace('—', '-').replace('–', '-'))
+    t = s.translate(_NORM_TABLE).strip()
     t = SLASH_RE.sub('', t)
-    t = re.sub(r'\s+', ' ', t)
-    t = re.sub(r':{2,}', ':', t)
-    t = re.sub(r'-{2,}', '-', t)
+    t = _WS_RE.sub(' ', t)
+    t = _DUP_SEP_RE.sub(lambda m: m.group(0)[0], t)  # '::' -> ':', '--' -> '-'
     return t
 
 
@@ -134,6 +176,20 @@ def _pairify(two_digit_maybe_split: str) -> int:
         raise ValueError("not a pair")
     return int(m.group(1) + m.group(2))
 
+def _valid_fields(y, M, d, h, mi, s) -> bool:
+    """Cheap range check so datetime() (and its exception path) only sees plausible fields."""
+    return (2000 <= y <= 2099 and 1 <= M <= 12 and 1 <= d <= 31
+            and 0 <= h <= 23 and 0 <= mi <= 59 and 0 <= s <= 59)
+
+def _to_datetime(y, M, d, h, mi, s):
+    """Return (datetime, fields) for a valid timestamp, else None."""
+    if not _valid_fields(y, M, d, h, mi, s):
+        return None
+    try:
+        return dt.datetime(y, M, d, h, mi, s), (y, M, d, h, mi, s)
+    except ValueError:
+        return None  # day past month end, e.g. Feb 30
+
 def _grab_fields_loose(t: str):
     """Legacy loose extractor expecting pairs; used as a noisy fallback."""
     ymatch = re.search(r'(20\d{2})', t)
@@ -158,13 +214,9 @@ def _grab_fields_loose(t: str):
             return None
         fields.append(val)
 
-    M, d, h, m_, s_ = fields
-    try:
-        dtobj = dt.datetime(y, M, d, h, m_, s_)
-        return dtobj, (y, M, d, h, m_, s_)
-    except ValueError:
-        return None
+    return _to_datetime(y, *fields)
 
+@lru_cache(maxsize=1024)  # pure: returns immutable (datetime, tuple) or (None, None)
 def parse_timestamp_flex(raw: str):
     if not raw:
         return None, None
@@ -179,83 +231,77 @@ def parse_timestamp_flex(raw: str):
         mtime = re.search(r'(\d{1,2})\s*:\s*(\d{2})\s*:\s*(\d{2})', rest)
         if mtime:
             h, m_, s_ = map(int, mtime.groups())
-            try:
-                return dt.datetime(y, M, d, h, m_, s_), (y, M, d, h, m_, s_)
-            except ValueError:
-                pass
+            res = _to_datetime(y, M, d, h, m_, s_)
+            if res:
+                return res
 
     # (1) Flexible 1–2 digit hour
     m = DATE_THEN_TIME_1OR2H.search(t)
     if m:
-        y, M, d, h, m_, s_ = map(int, m.groups())
-        try:
-            return dt.datetime(y, M, d, h, m_, s_), (y, M, d, h, m_, s_)
-        except ValueError:
-            pass
+        res = _to_datetime(*map(int, m.groups()))
+        if res:
+            return res
 
     # (2) Legacy loose pairs
     loose = _grab_fields_loose(t)
     if loose:
         return loose
 
-    # (3) Big flexible pattern
-    m = FLEX_PAT.search(t)
-    if m:
-        y, M, d, h, m_, s_ = map(int, m.groups())
-        try:
-            return dt.datetime(y, M, d, h, m_, s_), (y, M, d, h, m_, s_)
-        except ValueError:
-            pass
+    # (3)+(4) share one prefilter scan; no hit means none of them can match
+    fm = FALLBACK_RE.search(t)
+    if fm is None:
+        return None, None
+
+    # (3) Big flexible pattern (reuse the scan when FLEX itself matched first)
+    if fm.lastgroup == "a0":
+        fields = fm.groups()[1:7]  # a0 is group 1; its six fields are groups 2-7
+    else:
+        m = FLEX_PAT.search(t)
+        fields = m.groups() if m else None
+    if fields:
+        res = _to_datetime(*map(int, fields))
+        if res:
+            return res
 
     # (4) Strict fallbacks
     for pat in TS_PATTERNS:
-        m = re.search(pat, t)
+        m = pat.search(t)
         if m:
-            y, M, d, h, m_, s_ = map(int, m.groups())
-            try:
-                return dt.datetime(y, M, d, h, m_, s_), (y, M, d, h, m_, s_)
-            except ValueError:
-                continue
+            res = _to_datetime(*map(int, m.groups()))
+            if res:
+                return res
     return None, None
 
 
 # ========== 5) ROI & Variants ==================================================
-def moving_groups(idxs):
-    if not idxs:
-        return
-    start = prev = idxs[0]
-    for i in idxs[1:]:
-        if i == prev + 1:
-            prev = i
-            continue
-        yield (start, prev)
-        start = prev = i
-    yield (start, prev)
-
 def find_top_black_banner(gray: np.ndarray):
     """Locate the dark banner at the top where overlay lives; fallback to top 9% if unsure."""
     h, w = gray.shape
     top = gray[: int(h * 0.25), :]
-    row_means = top.mean(axis=1)
-    idxs = np.where(row_means < 60)[0].tolist()
-
-    best = None
-    for y0, y1 in moving_groups(idxs):
-        if y0 <= 5 and (y1 - y0 + 1) >= 10:
-            if best is None or (y1 - y0) > (best[1] - best[0]):
-                best = (y0, y1)
-
-    if best is None:
+    keep = np.zeros(0, dtype=bool)
+    if top.size:  # cv2.reduce returns None on an empty slice (images < 4 px tall)
+        # Dark rows: mean < 60, tested as integer row sums < 60*w (one SIMD pass, no floats)
+        row_sums = cv2.reduce(top, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+        dark = row_sums < 60 * w
+
+        # Runs of dark rows via edges of the padded mask (vectorized run-length pass)
+        edges = np.diff(np.r_[False, dark, False].astype(np.int8))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        keep = (starts <= 5) & (ends - starts + 1 >= 10)
+
+    if not keep.any():
         y0, y1 = 0, max(16, int(h * 0.09))
     else:
-        y0, y1 = best
+        i = int(np.argmax(np.where(keep, ends - starts, -1)))  # longest; first on ties
+        y0, y1 = int(starts[i]), int(ends[i])
 
     y0 = max(0, y0 - 2)
     y1 = min(h, y1 + 2)
     return y0, y1
 
 def variant_images(gray_small: np.ndarray):
-    """Generate binarized/rescaled variants for OCR."""
+    """Generate binarized/rescaled variants for OCR (inverted with cv2.bitwise_not)."""
     out = []
     scales = [
         ("cubic",   cv2.resize(gray_small, None, fx=2.2, fy=2.2, interpolation=cv2.INTER_CUBIC)),
@@ -263,17 +309,17 @@ def variant_images(gray_small: np.ndarray):
     ]
     for up_tag, big in scales:
         _, th = cv2.threshold(big, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        out.append((f"{up_tag}|otsu_inv", 255 - th))
+        out.append((f"{up_tag}|otsu_inv", cv2.bitwise_not(th)))
         if up_tag == "cubic":
             bl = cv2.GaussianBlur(big, (3, 3), 0)
             _, th2 = cv2.threshold(bl, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            out.append((f"{up_tag}|blur_otsu_inv", 255 - th2))
+            out.append((f"{up_tag}|blur_otsu_inv", cv2.bitwise_not(th2)))
             k = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 2))
             closed = cv2.morphologyEx(th2, cv2.MORPH_CLOSE, k, iterations=1)
-            out.append((f"{up_tag}|morph_inv", 255 - closed))
+            out.append((f"{up_tag}|morph_inv", cv2.bitwise_not(closed)))
         ad = cv2.adaptiveThreshold(big, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
                                    cv2.THRESH_BINARY, 31, 5)
-        out.append((f"{up_tag}|adapt_inv", 255 - ad))
+        out.append((f"{up_tag}|adapt_inv", cv2.bitwise_not(ad)))
     return out
 
 
@@ -297,6 +343,16 @@ def candidate_weight(roi_tag: str, var_tag: str, raw: str) -> float:
 PREFERRED_ROIS = {"left70", "full"}
 PREFERRED_VARS = {"cubic|morph_inv", "cubic|blur_otsu_inv"}
 
+# OCR order: (roi, variant) pairs by descending prior weight, best first
+PRIOR = sorted(((r, v) for r in ROI_WEIGHT for v in VARIANT_WEIGHT),
+               key=lambda p: ROI_WEIGHT[p[0]] + VARIANT_WEIGHT[p[1]], reverse=True)
+MAX_LAYOUT_BONUS = 0.6  # upper bound of rough_layout_bonus()
+
+# Text prefilter: a timestamp needs at least this many digit-sized blobs (YYYY-...)
+MIN_GLYPHS = 6
+GLYPH_H = (0.30, 0.95)  # blob height as a fraction of the crop height
+GLYPH_W = (0.10, 0.90)  # blob width as a fraction of the crop height
+
 def weighted_mode(values, weights):
     tally = defaultdict(float)
     for v, w in zip(values, weights):
@@ -356,36 +412,134 @@ def choose_by_weighted_fields(all_cands):
 
 
 # ========== 7) OCR Pipeline ====================================================
-def collect_candidates_from_roi(roi_gray, roi_tag, debug_lines):
+def candidate_from_raw(roi_tag, var_tag, im, raw, debug_lines):
+    """Parse one OCR string into a weighted candidate dict (or None), logging either way."""
+    dtobj, parts = parse_timestamp_flex(raw)
+    if not dtobj:
+        debug_lines.append(f"[{roi_tag}|{var_tag}] .. :: {raw}")
+        return None
+    canon = dtobj.strftime("%Y-%m-%d %H:%M:%S")
+    w = candidate_weight(roi_tag, var_tag, raw)
+    debug_lines.append(f"[{roi_tag}|{var_tag}] OK :: {raw} -> {canon}  (w={w:+.2f})")
+    return {
+        "dt": dtobj,
+        "canon": canon,
+        "parts": parts,
+        "raw": raw,
+        "roi": roi_tag,
+        "var": var_tag,
+        "img": im,
+        "w": w
+    }
+
+def ocr_line(im) -> str:
+    """OCR one single-line crop; uses the worker's tesserocr API when available."""
+    if _TESS_API is not None:
+        _TESS_API.SetImage(Image.fromarray(im))
+        return _TESS_API.GetUTF8Text()
+    return pytesseract.image_to_string(im, config=TESS_CFG)
+
+def count_glyphs(im) -> int:
+    """Count connected components shaped like digits (cheap gate before Tesseract)."""
+    h2 = im.shape[0]
+    _, _, stats, _ = cv2.connectedComponentsWithStats(cv2.bitwise_not(im), connectivity=8)
+    hs = stats[1:, cv2.CC_STAT_HEIGHT]
+    ws = stats[1:, cv2.CC_STAT_WIDTH]
+    ok = ((hs >= h2 * GLYPH_H[0]) & (hs <= h2 * GLYPH_H[1])
+          & (ws >= h2 * GLYPH_W[0]) & (ws <= h2 * GLYPH_W[1]))
+    return int(ok.sum())
+
+def looks_like_text(roi_tag, var_tag, im, debug_lines) -> bool:
+    """True if a crop has enough digit-like blobs to be worth OCR; logs skips."""
+    n = count_glyphs(im)
+    if n < MIN_GLYPHS:
+        debug_lines.append(f"[{roi_tag}|{var_tag}] -- skipped: {n} glyph-like blob(s)")
+        return False
+    return True
+
+def collect_candidates(rois, elite_margin: float, debug_lines, exhaustive: bool = False,
+                       prefilter: bool = True):
+    """
+    OCR ROI x variant pairs in descending prior weight (PRIOR). Stops early once an
+    elite candidate is certain: no untried pair, even with the best layout bonus,
+    could come within elite_margin of it - so the final pick is unchanged.
+    Once a preferred ROI reads cleanly (positive layout bonus), the negatively
+    weighted ROIs (mid60/right60) are skipped. exhaustive=True OCRs every pair.
+    With prefilter, crops without enough digit-like blobs are not sent to OCR;
+    if that gates every crop (e.g. text too small for the blob test), all crops
+    are OCR'd after all rather than returning nothing.
+    """
+    roi_imgs = dict(rois)
+    variants = {}  # roi_tag -> {var_tag: img}, built on first use
     cand = []
-    for vtag, im in variant_images(roi_gray):
-        raw = pytesseract.image_to_string(im, config=TESS_CFG).strip().replace("\n", " ")
-        dtobj, parts = parse_timestamp_flex(raw)
-        if dtobj:
-            canon = dtobj.strftime("%Y-%m-%d %H:%M:%S")
-            w = candidate_weight(roi_tag, vtag, raw)
-            cand.append({
-                "dt": dtobj,
-                "canon": canon,
-                "parts": parts,
-                "raw": raw,
-                "roi": roi_tag,
-                "var": vtag,
-                "img": im,
-                "w": w
-            })
-            debug_lines.append(f"[{roi_tag}|{vtag}] OK :: {raw} -> {canon}  (w={w:+.2f})")
-        else:
-            debug_lines.append(f"[{roi_tag}|{vtag}] .. :: {raw}")
+    n_ocr = 0
+    clean_preferred = False
+    for i, (rtag, vtag) in enumerate(PRIOR):
+        if clean_preferred and rtag not in PREFERRED_ROIS:
+            continue
+        if rtag not in variants:
+            variants[rtag] = dict(variant_images(roi_imgs[rtag]))
+        im = variants[rtag][vtag]
+        if prefilter and not looks_like_text(rtag, vtag, im, debug_lines):
+            continue
+        n_ocr += 1
+        raw = ocr_line(im).strip().replace("\n", " ")
+        c = candidate_from_raw(rtag, vtag, im, raw, debug_lines)
+        if c is None:
+            continue
+        cand.append(c)
+        if exhaustive or i + 1 == len(PRIOR):
+            continue
+        if not clean_preferred and rtag in PREFERRED_ROIS and rough_layout_bonus(raw) > 0:
+            clean_preferred = True
+            debug_lines.append(f"-- clean read from {rtag}|{vtag}: skipping non-preferred ROIs")
+        elite = choose_elite_candidate(cand, elite_margin)
+        nr, nv = PRIOR[i + 1]
+        best_future = ROI_WEIGHT[nr] + VARIANT_WEIGHT[nv] + MAX_LAYOUT_BONUS
+        if elite is not None and elite["w"] >= best_future + elite_margin:
+            debug_lines.append(f"-- early stop after {i + 1}/{len(PRIOR)} OCR calls: "
+                               f"{elite['roi']}|{elite['var']} is elite")
+            break
+
+    if prefilter and n_ocr == 0:
+        debug_lines.append("-- prefilter gated every crop: OCR them all anyway")
+        return collect_candidates(rois, elite_margin, debug_lines, exhaustive=exhaustive, prefilter=False)
     return cand
 
-def process_image(path, save_debug: bool, debug_dir: str, elite_margin: float):
+def ocr_batch(images):
+    """
+    OCR many single-line crops with ONE Tesseract call: stack them vertically
+    (white-padded so lines stay separate), then split words back by Y position.
+    """
+    width = max(im.shape[1] for im in images)
+    stripes, spans, y = [], [], 0
+    for im in images:
+        stripe = np.pad(im, ((BATCH_PAD, BATCH_PAD), (0, width - im.shape[1])), constant_values=255)
+        stripes.append(stripe)
+        spans.append((y, y + stripe.shape[0]))
+        y += stripe.shape[0]
+
+    data = pytesseract.image_to_data(np.vstack(stripes), config=TESS_CFG_BATCH, output_type=Output.DICT)
+    words = [[] for _ in images]
+    for text, top, height, left in zip(data["text"], data["top"], data["height"], data["left"]):
+        text = str(text).strip()
+        if not text:
+            continue
+        yc = top + height // 2
+        for i, (s0, s1) in enumerate(spans):
+            if s0 <= yc < s1:
+                words[i].append((left, text))
+                break
+    return [" ".join(t for _, t in sorted(ws)) for ws in words]
+
+def process_image(path, save_debug: bool, debug_dir: str, elite_margin: float, batch_ocr: bool = False,
+                  exhaustive: bool = False, prefilter: bool = True):
     base = os.path.splitext(os.path.basename(path))[0]
-    bgr = cv2.imread(path, cv2.IMREAD_COLOR)
-    if bgr is None:
+    # Only the grayscale top band is ever used, so decode straight to gray
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
         return None, ""
 
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
     y0, y1 = find_top_black_banner(gray)
     band = gray[y0:y1, :]
     H, W = band.shape
@@ -399,8 +553,19 @@ def process_image(path, save_debug: bool, debug_dir: str, elite_margin: float):
 
     all_cands = []
     debug_lines = []
-    for rtag, roi in rois:
-        all_cands.extend(collect_candidates_from_roi(roi, rtag, debug_lines))
+    if batch_ocr:
+        jobs = [(rtag, vtag, im) for rtag, roi in rois for vtag, im in variant_images(roi)]
+        if prefilter:
+            # Never gate away every crop: tiny text can fail the blob test yet still OCR fine
+            jobs = [j for j in jobs if looks_like_text(*j, debug_lines)] or jobs
+        raws = ocr_batch([im for _, _, im in jobs]) if jobs else []
+        for (rtag, vtag, im), raw in zip(jobs, raws):
+            c = candidate_from_raw(rtag, vtag, im, raw, debug_lines)
+            if c:
+                all_cands.append(c)
+    else:
+        all_cands = collect_candidates(rois, elite_margin, debug_lines,
+                                       exhaustive=exhaustive, prefilter=prefilter)
 
     if save_debug:
         ensure_dir(debug_dir)
@@ -430,18 +595,52 @@ def process_image(path, save_debug: bool, debug_dir: str, elite_margin: float):
     return dt_obj, (rep["raw"] if rep else "")
 
 
-# ========== 8) Driver ==========================================================
+# ========== 8) Worker Pool =====================================================
+# Per-worker settings, filled in by _init() in each pool process
+_WORKER_OPTS = {}
+_TESS_API = None  # per-worker tesserocr handle (None -> pytesseract subprocess per call)
+
+def _open_tess_api(tesseract_cmd: str):
+    """Create one in-process Tesseract API configured like TESS_CFG, or None if unavailable."""
+    if PyTessBaseAPI is None:
+        return None
+    tessdata = os.path.join(os.path.dirname(tesseract_cmd), "tessdata")
+    kw = {"path": tessdata + os.sep} if os.path.isdir(tessdata) else {}
+    try:
+        api = PyTessBaseAPI(psm=PSM.SINGLE_LINE, oem=OEM.DEFAULT, **kw)
+    except RuntimeError:
+        return None  # e.g. tessdata not found -> fall back to pytesseract
+    api.SetVariable("classify_bln_numeric_mode", "1")
+    api.SetVariable("tessedit_char_whitelist", "0123456789:-")
+    api.SetVariable("preserve_interword_spaces", "1")
+    return api
+
+def _init(tesseract_cmd: str, save_debug: bool, debug_dir: str, elite_margin: float, batch_ocr: bool,
+          exhaustive: bool, prefilter: bool):
+    """Pool initializer: set up Tesseract (in-process if possible) and stash per-run options."""
+    global _TESS_API
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    _TESS_API = _open_tess_api(tesseract_cmd)
+    _WORKER_OPTS.update(save_debug=save_debug, debug_dir=debug_dir, elite_margin=elite_margin,
+                        batch_ocr=batch_ocr, exhaustive=exhaustive, prefilter=prefilter)
+
+def worker(path):
+    """OCR one image -> (basename, timestamp string for CSV, raw OCR text)."""
+    dt_obj, raw = process_image(path, **_WORKER_OPTS)
+    ts_str = f'="{dt_obj.strftime("%Y-%m-%d %H:%M:%S")}"' if dt_obj else ""
+    return os.path.basename(path), ts_str, raw or ""
+
+
+# ========== 9) Driver ==========================================================
 def main():
     args = parse_args()
 
-    # Explicit Tesseract path (override-able)
-    pytesseract.pytesseract.tesseract_cmd = args.tesseract_cmd
-
     image_folder = args.image_folder
     output_csv = args.output_csv
     debug_dir = args.debug_dir or os.path.join(image_folder, "_ocr_debug")
     save_debug = bool(args.save_debug)
     elite_margin = float(args.elite_margin)
+    workers = max(1, args.workers or 1)
 
     if not os.path.isdir(image_folder):
         raise SystemExit(f"ERROR: Image folder not found: {image_folder}")
@@ -456,16 +655,20 @@ def main():
         print("No images found.")
         return
 
-    rows = [("file", "timestamp", "raw_ocr")]
-    for p in files:
-        dt_obj, raw = process_image(p, save_debug=save_debug, debug_dir=debug_dir, elite_margin=elite_margin)
-        ts_str = f'="{dt_obj.strftime("%Y-%m-%d %H:%M:%S")}"' if dt_obj else ""
-        print(f"Processing: {os.path.basename(p)} ... {ts_str or '[unreadable]'}")
-        rows.append((os.path.basename(p), ts_str, raw or ""))
-
+    # Images are independent, so OCR them in parallel. imap yields results in file
+    # order (buffering any that finish early), and each row is written and flushed
+    # as soon as it is ready, so an interrupted run leaves a usable partial CSV.
+    initargs = (args.tesseract_cmd, save_debug, debug_dir, elite_margin,
+                bool(args.batch_ocr), bool(args.exhaustive), not args.no_prefilter)
     ensure_dir(os.path.dirname(output_csv))
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        csv.writer(f).writerows(rows)
+    with open(output_csv, "w", newline="", encoding="utf-8") as f, \
+            mp.Pool(processes=workers, initializer=_init, initargs=initargs) as pool:
+        w = csv.writer(f)
+        w.writerow(("file", "timestamp", "raw_ocr"))
+        for name, ts_str, raw in pool.imap(worker, files, chunksize=2):
+            print(f"Processing: {name} ... {ts_str or '[unreadable]'}")
+            w.writerow((name, ts_str, raw))
+            f.flush()
     print(f"\nSaved: {output_csv}")
     if save_debug:
         print(f"Debug artifacts: {debug_dir}")
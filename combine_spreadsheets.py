@@ -3,9 +3,9 @@
 # Purpose: Fill missing Date/Time in a camera CSV (EXIF-derived) using the
 #          Date/Time from OCR'd last-frame PNG timestamps.
 # Author: Ashley Starr
-# Last Updated: 2025-08-16
+# Last Updated: 2026-10-15
 # Python: 3.8+
-# Requirements: pandas
+# Requirements: pandas, numpy, pyarrow (optional; faster CSV reads and string checks)
 #
 # Inputs:
 #   1) KO CSV  -> produced by: extract_timestamps.py + split_datetime_original.py
@@ -36,20 +36,70 @@
 import argparse
 import os
 import re
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # optional: multithreaded CSV reads + string compute kernels
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+MISSING_VALUES = ("", "not found")  # compared after strip + lower
+
 
 # ========== 1) Helpers =========================================================
+def _as_text(x) -> str:
+    """Render one value as fillna("").astype(str) would (NaN/None -> "")."""
+    if isinstance(x, str):
+        return x
+    return "" if pd.isna(x) else str(x)
+
+
 def is_missing(series: pd.Series) -> pd.Series:
-    """True for blank or 'Not found' (case-insensitive)."""
-    s = series.fillna("").astype(str).str.strip().str.lower()
-    return (s == "") | (s == "not found")
+    """True for blank or 'Not found' (case-insensitive); NaN/None count as blank."""
+    if pc is not None:
+        try:
+            # Zero-copy when the column is already Arrow-backed (pyarrow engine / pandas 3 str)
+            arr = pa.array(series, from_pandas=True)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            arr = None  # mixed objects: the Python pass below str()s them
+        if arr is not None and (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+            norm = pc.utf8_lower(pc.utf8_trim_whitespace(pc.fill_null(arr, "")))
+            mask = pc.is_in(norm, value_set=pa.array(MISSING_VALUES, type=arr.type))
+            return pd.Series(np.asarray(mask, dtype=bool), index=series.index)
+
+    # Single pass over the values instead of fillna/astype/strip/lower chained Series
+    mask = np.fromiter(
+        (_as_text(x).strip().lower() in MISSING_VALUES for x in series.to_numpy(dtype=object)),
+        dtype=bool,
+        count=len(series),
+    )
+    return pd.Series(mask, index=series.index)
+
+
+def read_str_csv(path: str) -> pd.DataFrame:
+    """Read a CSV with every column as str and blanks kept as "" (pyarrow engine if installed)."""
+    if pa is not None:
+        try:
+            return pd.read_csv(path, dtype=str, engine="pyarrow", keep_default_na=False)
+        except (pd.errors.ParserError, pa.ArrowInvalid):
+            pass  # e.g. hand-edited rows missing trailing fields; the C engine pads them with ""
+    # C engine; na_filter=False skips the NA scan that a fillna("") would undo
+    return pd.read_csv(path, dtype=str, engine="c", na_filter=False, low_memory=False)
+
+
+@lru_cache(maxsize=8)
+def compile_id_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile the --id_regex once; both KO and LF reuse the same pattern object."""
+    return re.compile(pattern)
 
 
 def extract_id(s: pd.Series, pattern: str) -> pd.Series:
-    """Extract shared ID (e.g., RCNX0020) using a regex capturing group."""
-    rgx = re.compile(pattern)
-    return s.astype(str).str.extract(rgx, expand=True)[0]
+    """Extract shared ID (e.g., RCNX0020) using a regex capturing group (s must be str)."""
+    return s.str.extract(compile_id_regex(pattern), expand=True)[0]
 
 
 # ========== 2) Core Pipeline ====================================================
@@ -59,8 +109,8 @@ def run(ko_csv: str, lf_csv: str, out_csv: str, id_regex: str) -> None:
     if not os.path.isfile(lf_csv):
         raise SystemExit(f"ERROR: LF CSV not found: {lf_csv}")
 
-    ko = pd.read_csv(ko_csv, dtype=str).fillna("")
-    lf = pd.read_csv(lf_csv, dtype=str).fillna("")
+    ko = read_str_csv(ko_csv)
+    lf = read_str_csv(lf_csv)
 
     # Normalize headers (defensive)
     ko.columns = [c.strip() for c in ko.columns]
@@ -77,34 +127,44 @@ def run(ko_csv: str, lf_csv: str, out_csv: str, id_regex: str) -> None:
     if "Date" not in lf.columns or "Time" not in lf.columns:
         raise SystemExit("ERROR: LF CSV must contain 'Date' and 'Time' columns (run PNG_split_date_time.py first).")
 
-    # Extract base IDs for joining (e.g., RCNX0020)
-    ko["__base"] = extract_id(ko["filename"], id_regex)
-    lf["__base"] = extract_id(lf[lf_file_col], id_regex)
+    # Extract base IDs (e.g., RCNX0020) and factorize both sides together into
+    # shared int32 codes, so the merge is a plain integer hash join
+    # (missing IDs -> -1)
+    ids = pd.concat([extract_id(ko["filename"], id_regex),
+                     extract_id(lf[lf_file_col], id_regex)], ignore_index=True)
+    codes = pd.factorize(ids)[0].astype(np.int32)
+    ko["__base"] = codes[:len(ko)]
+    lf["__base"] = codes[len(ko):]
 
     # Warn if IDs are missing
-    missing_ko_ids = ko["__base"].isna().sum()
-    missing_lf_ids = lf["__base"].isna().sum()
+    missing_ko_ids = int((ko["__base"] == -1).sum())
+    missing_lf_ids = int((lf["__base"] == -1).sum())
     if missing_ko_ids or missing_lf_ids:
         print(f"Warning: Missing IDs -> KO: {missing_ko_ids}, LF: {missing_lf_ids}. "
               f"Regex used: {id_regex}")
 
-    # Keep only the last-frame Date/Time we need
-    lf_small = lf[["__base", "Date", "Time"]].rename(columns={"Date": "__LF_Date", "Time": "__LF_Time"})
+    # Keep only the last-frame Date/Time we need: one row per ID (first wins),
+    # and no ID-less rows, so every KO row matches at most one LF row
+    lf_small = lf.loc[lf["__base"] >= 0, ["__base", "Date", "Time"]]
+    lf_small = lf_small.drop_duplicates("__base", keep="first")
+    lf_small = lf_small.rename(columns={"Date": "__LF_Date", "Time": "__LF_Time"})
 
-    # Left-join LF onto KO
-    m = ko.merge(lf_small, on="__base", how="left")
+    # Left-join LF onto KO (many-to-one: KO row count is preserved)
+    m = ko.merge(lf_small, on="__base", how="left", validate="m:1")
 
-    # Masks where KO is missing but LF has values
-    mask_date_missing = is_missing(m["Date"]) & m["__LF_Date"].fillna("").ne("")
-    mask_time_missing = is_missing(m["Time"]) & m["__LF_Time"].fillna("").ne("")
+    # Masks (as ndarrays) where KO is missing but LF has values
+    lf_date = m["__LF_Date"].fillna("").to_numpy()
+    lf_time = m["__LF_Time"].fillna("").to_numpy()
+    mask_date_missing = is_missing(m["Date"]).to_numpy() & (lf_date != "")
+    mask_time_missing = is_missing(m["Time"]).to_numpy() & (lf_time != "")
 
     # Counters before filling
-    n_before_date = mask_date_missing.sum()
-    n_before_time = mask_time_missing.sum()
+    n_before_date = int(mask_date_missing.sum())
+    n_before_time = int(mask_time_missing.sum())
 
-    # Fill ONLY where KO missing
-    m.loc[mask_date_missing, "Date"] = m.loc[mask_date_missing, "__LF_Date"]
-    m.loc[mask_time_missing, "Time"] = m.loc[mask_time_missing, "__LF_Time"]
+    # Fill ONLY where KO missing (one vectorized select per column, no masked setitem)
+    m["Date"] = np.where(mask_date_missing, lf_date, m["Date"].to_numpy())
+    m["Time"] = np.where(mask_time_missing, lf_time, m["Time"].to_numpy())
 
     # Drop helper columns
     m = m.drop(columns=["__LF_Date", "__LF_Time", "__base"], errors="ignore")
@@ -113,7 +173,8 @@ def run(ko_csv: str, lf_csv: str, out_csv: str, id_regex: str) -> None:
     out_dir = os.path.dirname(out_csv)
     if out_dir and not os.path.isdir(out_dir):
         os.makedirs(out_dir, exist_ok=True)
-    m.to_csv(out_csv, index=False)
+    with open(out_csv, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        m.to_csv(f, index=False)
 
     print(f"✅ Filled KO timestamps saved to:\n{out_csv}")
     print(f"Filled from LF -> Date: {n_before_date} row(s), Time: {n_before_time} row(s)")
@@ -3,9 +3,9 @@
 # Purpose: Scan ONE folder, collect EXIF DateTimeOriginal for JPG/JPEG images
 #          and Last-Modified timestamps for .AVI videos, then write to CSV.
 # Author: Ashley Starr
-# Last Updated: 2025-08-17
+# Last Updated: 2026-10-15
 # Python: 3.8+
-# Requirements: pillow, pandas
+# Requirements: pillow, exifread (optional; faster EXIF reads)
 #
 # Usage (CHANGE THESE PATHS):
 #   Windows (CMD/PowerShell):
@@ -19,129 +19,232 @@
 # - DateTimeOriginal is preserved as reported by the camera (e.g., "YYYY:MM:DD HH:MM:SS").
 # - Last-Modified is reported in local time ("YYYY-MM-DD HH:MM:SS").
 # - Files other than .jpg/.jpeg/.avi are ignored.
+# - Files are read in parallel threads; output rows stay in filename order.
+# - DateTimeOriginal is read by a small built-in JPEG/EXIF parser; exifread or
+#   Pillow is only used for files it can't handle.
 # =============================================================================
 
 # ========== 0) Imports & Globals ==============================================
 import os
 import argparse
-from datetime import datetime
-from typing import Dict, List, Optional
+import csv
+import logging
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
-import pandas as pd
 from PIL import Image
-from PIL.ExifTags import TAGS
+
+try:
+    import exifread  # reads only the EXIF header segment; Pillow is the fallback
+    # exifread logs "File format not recognized." etc.; errors are reported via Pillow instead
+    logging.getLogger("exifread").setLevel(logging.CRITICAL)
+except ImportError:
+    exifread = None
+
+DTO_TAG_ID = 0x9003  # EXIF tag id for DateTimeOriginal
+EXIF_IFD_ID = 0x8769  # pointer to the Exif sub-IFD, where DateTimeOriginal lives
+JPEG_HEAD_BYTES = 1 << 17  # APP1 is capped at 64 KiB; leave room for APP0 before it
+
+# CSV rows are plain tuples in this column order
+COLUMNS = ("filename", "type", "DateTimeOriginal", "LastModified")
+Row = Tuple[str, str, str, str]
 
 
 # ========== 1) Helper Functions ===============================================
+def _find_ifd_entry(buf: bytes, tiff: int, endian: str, ifd: int, tag: int) -> Optional[Tuple[int, int]]:
+    """Return (count, value_pos) of `tag` in the IFD at offset `ifd` (TIFF-relative), else None."""
+    n = struct.unpack_from(endian + "H", buf, tiff + ifd)[0]
+    entry = tiff + ifd + 2
+    for _ in range(n):
+        t, _typ, count = struct.unpack_from(endian + "HHI", buf, entry)
+        if t == tag:
+            return count, entry + 8
+        entry += 12
+    return None
+
+
+def read_jpeg_dto(img_path: str) -> Optional[str]:
+    """
+    Read DateTimeOriginal straight from a JPEG's APP1/EXIF segment with struct.
+    Returns None when the file isn't a plain EXIF JPEG or the tag isn't where
+    expected; the caller then falls back to exifread/Pillow.
+    """
+    with open(img_path, "rb") as f:
+        buf = f.read(JPEG_HEAD_BYTES)
+    if buf[:2] != b"\xff\xd8":
+        return None
+
+    try:
+        # Walk marker segments up to the first APP1 "Exif" block
+        pos = 2
+        while True:
+            if buf[pos] != 0xFF:
+                return None
+            marker = buf[pos + 1]
+            if marker == 0xFF:  # fill byte
+                pos += 1
+                continue
+            if marker in (0xD9, 0xDA):  # EOI / start of scan: no EXIF ahead
+                return None
+            seg_len = struct.unpack_from(">H", buf, pos + 2)[0]
+            if marker == 0xE1 and buf[pos + 4:pos + 10] == b"Exif\x00\x00":
+                break
+            pos += 2 + seg_len
+
+        # TIFF header: byte order, then IFD0 offset
+        tiff = pos + 10
+        order = buf[tiff:tiff + 2]
+        if order not in (b"II", b"MM"):
+            return None
+        endian = "<" if order == b"II" else ">"
+        ifd0 = struct.unpack_from(endian + "I", buf, tiff + 4)[0]
+
+        # DateTimeOriginal normally sits in the Exif sub-IFD; a few writers put it in IFD0
+        found = None
+        ptr = _find_ifd_entry(buf, tiff, endian, ifd0, EXIF_IFD_ID)
+        if ptr is not None:
+            exif_ifd = struct.unpack_from(endian + "I", buf, ptr[1])[0]
+            found = _find_ifd_entry(buf, tiff, endian, exif_ifd, DTO_TAG_ID)
+        if found is None:
+            found = _find_ifd_entry(buf, tiff, endian, ifd0, DTO_TAG_ID)
+        if found is None:
+            return None
+
+        # ASCII value: inline if <= 4 bytes, otherwise at a TIFF-relative offset
+        count, value_pos = found
+        if count > 4:
+            value_pos = tiff + struct.unpack_from(endian + "I", buf, value_pos)[0]
+        raw = buf[value_pos:value_pos + count]
+        if len(raw) < count:  # ran past what we read
+            return None
+        value = raw.split(b"\x00", 1)[0].decode("ascii")
+        return value or None
+    except (IndexError, struct.error, UnicodeDecodeError):
+        return None
+
+
 def get_datetime_original(img_path: str) -> str:
     """
     Return the EXIF DateTimeOriginal string for a JPEG/JPG image if present.
     If not found, returns "Not found". On error, returns "Error: <message>".
     """
     try:
+        dto = read_jpeg_dto(img_path)
+        if dto is not None:
+            return dto
+
+        if exifread is not None:
+            # Parse the EXIF segment only, stopping as soon as the tag is read
+            with open(img_path, "rb") as f:
+                tags = exifread.process_file(f, stop_tag="DateTimeOriginal", details=False)
+            if tags:
+                tag = tags.get("EXIF DateTimeOriginal")
+                return str(tag.values) if tag else "Not found"
+            # Empty result: unreadable/non-JPEG file -> let Pillow raise the real error
+
         with Image.open(img_path) as img:
-            exif = None
-            # Try both EXIF access methods for Pillow compatibility
-            try:
-                exif = img._getexif()
-            except Exception:
-                exif = None
-            if not exif:
-                try:
-                    exif = img.getexif()
-                except Exception:
-                    exif = None
-
-            if exif:
-                items = dict(exif) if not isinstance(exif, dict) else exif
-                for tag_id, value in items.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    if tag == "DateTimeOriginal":
-                        return str(value)
-        return "Not found"
+            # Header-only read; no pixel decode and no flattened tag dict
+            exif = img.getexif()
+            val = exif.get_ifd(EXIF_IFD_ID).get(DTO_TAG_ID)
+            if val is None:
+                val = exif.get(DTO_TAG_ID)  # a few writers put it in IFD0
+            return str(val) if val is not None else "Not found"
     except Exception as e:
         return f"Error: {e}"
 
 
-def get_last_modified(path: str) -> str:
+def get_last_modified(entry: "os.DirEntry | str") -> str:
     """
     Return last-modified timestamp (local time) in 'YYYY-MM-DD HH:MM:SS' format,
-    or 'Error: <message>' if retrieval fails.
+    or 'Error: <message>' if retrieval fails. Accepts a path or an os.DirEntry
+    (whose stat result is cached from the directory scan).
     """
     try:
-        mod_ts = os.path.getmtime(path)
-        return datetime.fromtimestamp(mod_ts).strftime("%Y-%m-%d %H:%M:%S")
+        mod_ts = entry.stat().st_mtime if isinstance(entry, os.DirEntry) else os.path.getmtime(entry)
+        # Straight to struct_time; datetime.strftime builds the same tuple internally
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mod_ts))
     except Exception as e:
         return f"Error: {e}"
 
 
-def scan_folder(folder: str) -> List[Dict[str, str]]:
+def scan_file(entry: os.DirEntry) -> Optional[Row]:
+    """
+    Build the CSV row for ONE directory entry (EXIF for .jpg/.jpeg, last-modified
+    for .avi). Returns None for folders and other file types. Thread-safe.
+    """
+    if not entry.is_file():
+        return None
+
+    filename = entry.name
+    lower = filename.lower()
+
+    if lower.endswith((".jpg", ".jpeg")):
+        return (filename, "image", get_datetime_original(entry.path), "")
+    if lower.endswith(".avi"):
+        return (filename, "video", "", get_last_modified(entry))
+    # Ignore other file types
+    return None
+
+
+def scan_folder(folder: str) -> List[Row]:
     """
     Non-recursively scan ONE folder, extracting:
       - For .jpg/.jpeg: EXIF DateTimeOriginal
       - For .avi:       Last modified timestamp
-    Returns list of row dicts ready for CSV.
+    Files are read on a thread pool (the work is I/O-bound), but rows and
+    progress messages stay in sorted filename order.
+    Returns list of row tuples (see COLUMNS) ready for CSV.
     """
-    rows: List[Dict[str, str]] = []
+    rows: List[Row] = []
     image_count = 0
     video_count = 0
 
-    for filename in sorted(os.listdir(folder)):
-        path = os.path.join(folder, filename)
-        if not os.path.isfile(path):
-            continue
+    # One scandir pass: entries carry file type (and on Windows, mtime) from the listing.
+    # Drop non-media names before sorting so only the files we report get sorted.
+    with os.scandir(folder) as it:
+        entries = sorted(
+            (e for e in it if e.name.lower().endswith((".jpg", ".jpeg", ".avi"))),
+            key=lambda e: e.name,
+        )
+    workers = min(32, (os.cpu_count() or 1) * 4)
 
-        lower = filename.lower()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for row in ex.map(scan_file, entries):
+            if row is None:
+                continue
+            filename, kind, dto, lm = row
 
-        if lower.endswith((".jpg", ".jpeg")):
-            dto = get_datetime_original(path)
-            if dto.startswith("Error:"):
-                print(f"{filename}: Error reading file ({dto[7:].strip()})")
-            elif dto == "Not found":
-                print(f"{filename}: DateTimeOriginal NOT found.")
-            else:
-                print(f"{filename}: DateTimeOriginal = {dto}")
-            rows.append(
-                {
-                    "filename": filename,
-                    "type": "image",
-                    "DateTimeOriginal": dto,
-                    "LastModified": "",
-                }
-            )
-            image_count += 1
-
-        elif lower.endswith(".avi"):
-            lm = get_last_modified(path)
-            if lm.startswith("Error:"):
-                print(f"{filename}: {lm}")
+            if kind == "image":
+                if dto.startswith("Error:"):
+                    print(f"{filename}: Error reading file ({dto[7:].strip()})")
+                elif dto == "Not found":
+                    print(f"{filename}: DateTimeOriginal NOT found.")
+                else:
+                    print(f"{filename}: DateTimeOriginal = {dto}")
+                image_count += 1
             else:
-                print(f"{filename}: Last modified = {lm}")
-            rows.append(
-                {
-                    "filename": filename,
-                    "type": "video",
-                    "DateTimeOriginal": "",
-                    "LastModified": lm,
-                }
-            )
-            video_count += 1
-
-        else:
-            # Ignore other file types
-            continue
+                if lm.startswith("Error:"):
+                    print(f"{filename}: {lm}")
+                else:
+                    print(f"{filename}: Last modified = {lm}")
+                video_count += 1
+
+            rows.append(row)
 
     print(f"\nSummary: {image_count} image(s), {video_count} video(s) processed.")
     return rows
 
 
-def save_csv(rows: List[Dict[str, str]], output_csv: str) -> None:
+def save_csv(rows: List[Row], output_csv: str) -> None:
     """
     Save collected rows to CSV (UTF-8, no index). Ensures headers exist even if no rows.
     """
-    columns = ["filename", "type", "DateTimeOriginal", "LastModified"]
-    df = pd.DataFrame(rows, columns=columns)
-    df.to_csv(output_csv, index=False)
+    with open(output_csv, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        w = csv.writer(f, lineterminator=os.linesep)
+        w.writerow(COLUMNS)
+        w.writerows(rows)
     print(f"Done! Results saved to {output_csv}")
 
 
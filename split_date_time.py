@@ -3,7 +3,7 @@
 # Purpose: Read a CSV, split the "DateTimeOriginal" column into separate
 #          "Date" (YYYY-MM-DD) and "Time" (HH:MM:SS) columns, and write a new CSV.
 # Author: Ashley Starr
-# Last Updated: 2025-08-17
+# Last Updated: 2026-10-15
 # Python: 3.8+
 # Requirements: pandas
 #
@@ -31,6 +31,21 @@ import os
 import pandas as pd
 import re
 
+# Full "date time" value; the date may use ":", "-" or "/" as its separators
+DT_RE = re.compile(
+    r"^\s*(?P<y>\d{4})[:/\-](?P<m>\d{2})[:/\-](?P<d>\d{2})\s+(?P<t>\d{2}:\d{2}:\d{2})\s*$"
+)
+NOT_FOUND = ("Not found", "Not found")
+
+
+def split_value(value) -> tuple:
+    """One cell -> ('YYYY-MM-DD', 'HH:MM:SS'), or ('Not found', 'Not found') if it doesn't parse."""
+    m = DT_RE.match(value) if isinstance(value, str) else None
+    if m is None:
+        return NOT_FOUND
+    y, mo, d, t = m.groups()
+    return f"{y}-{mo}-{d}", t
+
 
 # ========== 1) Core Function ===================================================
 def split_datetime_column(df: pd.DataFrame, col: str) -> pd.DataFrame:
@@ -47,27 +62,11 @@ def split_datetime_column(df: pd.DataFrame, col: str) -> pd.DataFrame:
     if col not in df.columns:
         raise SystemExit(f"ERROR: Column '{col}' not found in CSV. Available columns: {list(df.columns)}")
 
-    # Normalize to string and strip whitespace
-    dt_series = df[col].fillna("").astype(str).str.strip()
-
-    # Flag obviously bad entries early
-    bad_mask = dt_series.eq("") | dt_series.str.match(r"^(Not found|Error:)", flags=re.IGNORECASE)
-
-    # Extract date + time parts with a permissive regex (colon, dash, or slash separators for date)
-    parts = dt_series.str.extract(r"^\s*(\d{4}[:/\-]\d{2}[:/\-]\d{2})\s+(\d{2}:\d{2}:\d{2})\s*$")
-
-    # Build Date column: replace ":" and "/" with "-" in the date part
-    date_col = parts[0].where(~bad_mask, other="Not found").fillna("Not found")
-    date_col = date_col.str.replace(r"[:/]", "-", regex=True)
-
-    # Build Time column: keep HH:MM:SS as-is
-    time_col = parts[1].where(~bad_mask, other="Not found").fillna("Not found")
-
-    # Optional: enforce strict HH:MM:SS; anything else -> Not found
-    time_col = time_col.where(time_col.str.match(r"^\d{2}:\d{2}:\d{2}$") | time_col.eq("Not found"), other="Not found")
+    # One per-row pass yields both parts; empty/NaN/'Not found'/'Error:' simply don't match
+    pairs = [split_value(v) for v in df[col].to_numpy(dtype=object)]
 
-    df["Date"] = date_col
-    df["Time"] = time_col
+    df["Date"] = [d for d, _ in pairs]
+    df["Time"] = [t for _, t in pairs]
     return df
 
 